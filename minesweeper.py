@@ -1,21 +1,23 @@
 import tkinter as tk
-from random import shuffle
+from random import sample
 from tkinter.messagebox import showinfo, showerror
-from PIL import ImageTk, Image
-from typing import List, Set, Tuple, Dict
-from itertools import combinations
-from collections import defaultdict
+from typing import List, Set, Tuple, Dict, FrozenSet, Deque, Optional
+from itertools import chain, product
+from collections import defaultdict, deque
+from functools import lru_cache
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from typing import List
 import pandas as pd
 import time
 import argparse
+import multiprocessing as mp
+import os
+import queue
+import threading
 from tqdm import tqdm
-
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
 
 
 
@@ -31,6 +33,9 @@ COLORS = {
     8: '#800020'   # Maroon
 }
 
+# Number colors indexed directly by neighbour count (0-8)
+COLOR_BY_COUNT = tuple(COLORS.get(i, 'black') for i in range(9))
+
 BUTTON_COLORS = {
     'default': '#f0f0f0',      # Light gray for unopened cells
     'revealed': '#ffffff',      # White for revealed cells
@@ -38,76 +43,216 @@ BUTTON_COLORS = {
     'flagged': '#e0e0e0'       # Slightly darker gray for flagged cells
 }
 
+# Target delay between auto-solve moves (~60 moves per second)
+AUTO_SOLVE_FRAME_MS = 16
+
+# Size in pixels of one board cell on the canvas
+CELL_SIZE = 36
+
 
-# Button class to represent each cell in the grid
-class MyButton(tk.Button):
-    def __init__(self, master, x, y, number=0, *args, **kwargs):
-        super(MyButton, self).__init__(
-            master, *args, **kwargs, width=3, font='Calibri 15 bold',
-            background=BUTTON_COLORS['default'])  # Set default background
+# Cell class for one grid position; headless games use it directly, without any Tk widget
+class Cell:
+    __slots__ = ('game', 'x', 'y', 'number')
+
+    def __init__(self, game, x, y, number=0):
+        self.game = game  # board arrays live on the game
         self.x = x  # row index
         self.y = y  # column index
         self.number = number  # cell number
-        self.is_mine = False
-        self.count_bomb = 0  # number of neighboring mines
-        self.is_open = False
+
+    # Open, mine and neighbour-count state lives in the game's NumPy grids
+    @property
+    def is_open(self):
+        return bool(self.game.is_open[self.x, self.y])
+
+    @is_open.setter
+    def is_open(self, value):
+        self.game.is_open[self.x, self.y] = value
+
+    @property
+    def is_mine(self):
+        return bool(self.game.is_mine[self.x, self.y])
+
+    @property
+    def count_bomb(self):
+        return int(self.game.count_bomb[self.x, self.y])  # number of neighboring mines
 
     def __repr__(self):
-        return f'MyButton{self.x} {self.y} {self.number} {self.is_mine}'
+        return f'{type(self).__name__}{self.x} {self.y} {self.number} {self.is_mine}'
+
+
+# Button class to represent each cell in the grid, drawn as items on the shared board canvas
+class MyButton(Cell):
+    __slots__ = ('canvas', 'rect', 'label', 'icon', 'state')
+
+    def __init__(self, canvas, game, x, y, number=0):
+        super(MyButton, self).__init__(game, x, y, number)
+        self.canvas = canvas
+        left, top = (y - 1) * CELL_SIZE, (x - 1) * CELL_SIZE
+        center_x, center_y = left + CELL_SIZE // 2, top + CELL_SIZE // 2
+        self.rect = canvas.create_rectangle(left, top, left + CELL_SIZE, top + CELL_SIZE,
+                                            fill=BUTTON_COLORS['default'],  # Set default background
+                                            outline='#a0a0a0')
+        self.label = canvas.create_text(center_x, center_y, font='Calibri 15 bold')
+        self.icon = canvas.create_image(center_x, center_y)
+        self.state = 'normal'  # 'disabled' once opened or flagged, as on a tk.Button
+
+    # Update the cell's canvas items, taking the tk.Button options the game sets
+    def configure(self, text=None, image=None, background=None, disabledforeground=None,
+                  state=None):
+        if background is not None:
+            self.canvas.itemconfigure(self.rect, fill=background)
+        label_options = {}
+        if text is not None:
+            label_options['text'] = text
+        if disabledforeground is not None:
+            label_options['fill'] = disabledforeground
+        if label_options:
+            self.canvas.itemconfigure(self.label, **label_options)
+        if image is not None:
+            self.canvas.itemconfigure(self.icon, image=image)
+        if state is not None:
+            self.state = state
 
 
 # AI solver agent class
 class MinesweeperSolver:
     def __init__(self, game: 'MineSweeper'):
         self.game = game
-        self.known_mines: Set[Tuple[int, int]] = set()
-        self.known_safe: Set[Tuple[int, int]] = set()
-        self.frontier: Set[Tuple[int, int]] = set()
-        self.constraints: Dict[Tuple[int, int],
-                               List[Tuple[Set[Tuple[int, int]], int]]] = defaultdict(list)
+        # Cells are interned as single ints, x * width + y over the padded board,
+        # so solver sets and dicts hash one int instead of an (x, y) tuple
+        self.width = game.COLUMNS + 2
+        # Flat views of the game's grids, so a cell id indexes them directly
+        self.is_open: np.ndarray = game.is_open.ravel()
+        self.count_bomb: np.ndarray = game.count_bomb.ravel()
+
+        self.known_mines: Set[int] = set()
+        self.known_mine_flags = np.zeros(game.is_open.size, dtype=bool)  # known_mines as a flat grid
+        self.known_safe: Set[int] = set()
+        # Safe cells waiting to be clicked, reused across moves until they run out
+        self.safe_queue: Deque[int] = deque()
+        # The constraint owned by each numbered cell that has one
+        self.constraints: Dict[int, Tuple[FrozenSet[int], int]] = {}
+        # Number of numbered cells owning each distinct constraint, kept up to date as
+        # constraints are rescanned so the deduplicated view never needs a full rebuild
+        self.constraint_owners: Dict[Tuple[FrozenSet[int], int], int] = {}
+        # Number of distinct constraints containing each frontier cell
+        self.frontier: Dict[int, int] = {}
+        self.constraint_list: List[Tuple[FrozenSet[int], int]] = []
+        # Hashable copy of constraint_list, used as the key for cached risk scores
+        self.snapshot: FrozenSet[Tuple[FrozenSet[int], int]] = frozenset()
         self.total_mines = game.MINES
         self.mines_found = 0
+        # Cells opened or found to be mines since constraints were last updated
+        self.dirty_cells: Set[int] = set()
+        # Owners of constraints basic_solve has not checked since they changed
+        self.unchecked_owners: Set[int] = set()
 
-    def get_unopened_neighbors(self, x: int, y: int) -> Set[Tuple[int, int]]:
-        neighbors = set()
-        for dx in [-1, 0, 1]:  # iterate over neighboring rows
-            for dy in [-1, 0, 1]:  # iterate over neighboring columns
-
-                # Skip the cell itself
-                if dx == 0 and dy == 0:
-                    continue
+        self.neighbors = self.neighbor_tables(game.ROW, game.COLUMNS)
 
-                new_x, new_y = x + dx, y + dy  # calculate coordinates of the neighboring cell
+    # In-bounds neighbours of every cell id, built once per board size and shared
+    # by every solver
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def neighbor_tables(rows: int, columns: int) -> Tuple[Tuple[int, ...], ...]:
+        width = columns + 2
+        neighbors = [()] * ((rows + 2) * width)
+        for i in range(1, rows + 1):
+            for j in range(1, columns + 1):
+                neighbors[i * width + j] = tuple(
+                    (i + dx) * width + j + dy
+                    for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                    if (dx or dy) and 1 <= i + dx <= rows and 1 <= j + dy <= columns)
+        return tuple(neighbors)
+
+    def cell_id(self, x: int, y: int) -> int:
+        return x * self.width + y
+
+    def cell_coords(self, cell: int) -> Tuple[int, int]:
+        return divmod(cell, self.width)
+
+    def get_unopened_neighbors(self, cell: int) -> Set[int]:
+        is_open = self.is_open
+        return {neighbor for neighbor in self.neighbors[cell]
+                if not is_open[neighbor]}  # return the set of unopened neighbors
 
-                # Add the cell to neighbors after checking for bounds and unopened state
-                if (1 <= new_x <= self.game.ROW and
-                    1 <= new_y <= self.game.COLUMNS and
-                        not self.game.buttons[new_x][new_y].is_open):
-                    neighbors.add((new_x, new_y))
+    def update_constraints(self):
+        # Nothing was opened or marked since the last update, so the constraints still hold
+        if not self.dirty_cells:
+            return
 
-        return neighbors  # return the set of unopened neighbors
+        # Only the changed cells and the numbered cells around them can have new constraints
+        owners = set(self.dirty_cells)
+        for cell in self.dirty_cells:
+            owners.update(self.neighbors[cell])
+        self.dirty_cells.clear()
+
+        for cell in owners:
+            self.scan_constraint(cell)
+        self.unchecked_owners.update(owners)
+
+        # Equal constraints from different numbered cells only need to be compared once
+        self.constraint_list = list(self.constraint_owners)
+        self.snapshot = frozenset(self.constraint_owners)
+
+    # Give a numbered cell a constraint, adding its cells to the frontier if it is new
+    def add_constraint(self, cell: int, constraint: Tuple[FrozenSet[int], int]):
+        self.constraints[cell] = constraint
+        owners = self.constraint_owners.get(constraint, 0)
+        if not owners:
+            for unopened in constraint[0]:
+                self.frontier[unopened] = self.frontier.get(unopened, 0) + 1
+        self.constraint_owners[constraint] = owners + 1
+
+    # Take away a numbered cell's stale constraint, dropping it if no other cell owns it
+    def drop_constraint(self, cell: int):
+        constraint = self.constraints.pop(cell, None)
+        if constraint is None:
+            return
+        owners = self.constraint_owners.pop(constraint) - 1
+        if owners:
+            self.constraint_owners[constraint] = owners
+            return
+        for unopened in constraint[0]:
+            if self.frontier[unopened] == 1:
+                del self.frontier[unopened]
+            else:
+                self.frontier[unopened] -= 1
+
+    # Rebuild the constraint owned by one cell
+    def scan_constraint(self, cell: int):
+        self.drop_constraint(cell)
+        count_bomb = int(self.count_bomb[cell])
+        if self.is_open[cell] and count_bomb > 0:  # only for cells with neighboring mines
+            unopened = self.get_unopened_neighbors(cell)
+            if unopened:  # only if there are unopened neighbor cells
+                # number of neighboring KNOWN mines
+                known_mines = len(
+                    unopened.intersection(self.known_mines))
+                # number of undiscovered neighboring mines
+                remaining_mines = count_bomb - known_mines
+                unopened = unopened.difference(self.known_mines)
+                # Update constraints if there are unopened neighbors
+                if unopened:
+                    self.add_constraint(cell, (frozenset(unopened), remaining_mines))
+
+    # Record a deduced mine, returning True if it was not already known
+    def mark_mine(self, mine: int) -> bool:
+        if mine in self.known_mines:
+            return False
+        self.known_mines.add(mine)
+        self.known_mine_flags[mine] = True
+        self.dirty_cells.add(mine)
+        self.mines_found += 1
+        return True
 
-    def update_constraints(self):
-        self.constraints.clear()
-        self.frontier.clear()
-
-        for i in range(1, self.game.ROW + 1):  # iterate through rows
-            for j in range(1, self.game.COLUMNS + 1):  # iterate through columns
-                btn = self.game.buttons[i][j]
-                if btn.is_open and btn.count_bomb > 0:  # only for cells with neighboring mines
-                    unopened = self.get_unopened_neighbors(i, j)
-                    if unopened:  # only if there are unopened neighbor cells
-                        # number of neighboring KNOWN mines
-                        known_mines = len(
-                            unopened.intersection(self.known_mines))
-                        # number of undiscovered neighboring mines
-                        remaining_mines = btn.count_bomb - known_mines
-                        unopened = unopened.difference(self.known_mines)
-                        # Update constraints and frontier if there are unopened neighbors
-                        if unopened:
-                            self.constraints[(i, j)].append(
-                                (unopened, remaining_mines))
-                            self.frontier.update(unopened)
+    # Record a deduced safe cell, returning True if it was not already known
+    def mark_safe(self, safe: int) -> bool:
+        if safe in self.known_safe:
+            return False
+        self.known_safe.add(safe)
+        self.safe_queue.append(safe)
+        return True
 
     # Basic solver for if the number of neighboring mines equal the number of unopened neighbors or the number of known mines
     def basic_solve(self) -> bool:
@@ -115,23 +260,28 @@ class MinesweeperSolver:
 
         self.update_constraints()
 
-        for cell, constraint_list in self.constraints.items():
-            for unopened_cells, remaining_mines in constraint_list:
-
-                # If the number of neighboring mines equals the number of unopened neighbors, mark them all as mines
-                if len(unopened_cells) == remaining_mines and remaining_mines > 0:
-                    for mine in unopened_cells:
-                        if mine not in self.known_mines:
-                            self.known_mines.add(mine)
-                            self.mines_found += 1
-                            made_progress = True
-
-                # If there are no undiscovered neighboring mines, mark the rest of the neighbors as safe
-                elif remaining_mines == 0:
-                    for safe in unopened_cells:
-                        if safe not in self.known_safe:
-                            self.known_safe.add(safe)
-                            made_progress = True
+        # A constraint checked since it last changed has nothing new to give
+        while self.unchecked_owners:
+            cell = self.unchecked_owners.pop()
+            if cell not in self.constraints:
+                continue
+            unopened_cells, remaining_mines = self.constraints[cell]
+
+            # If the number of neighboring mines equals the number of unopened neighbors, mark them all as mines
+            if len(unopened_cells) == remaining_mines and remaining_mines > 0:
+                for mine in unopened_cells:
+                    if self.mark_mine(mine):
+                        made_progress = True
+
+            # If there are no undiscovered neighboring mines, mark the rest of the neighbors as safe
+            elif remaining_mines == 0:
+                found_safe = False
+                for safe in unopened_cells:
+                    if self.mark_safe(safe):
+                        found_safe = True
+                # Stop at the first new safe cell; make_move clicks it straight away
+                if found_safe:
+                    return True
 
         return made_progress
 
@@ -139,86 +289,132 @@ class MinesweeperSolver:
     def advanced_solve(self) -> bool:
         made_progress = False
 
-        for (cell1, constraints1), (cell2, constraints2) in combinations(self.constraints.items(), 2):
-            for (cells1, mines1), (cells2, mines2) in [(c1, c2)
-                                                       for c1 in constraints1
-                                                       for c2 in constraints2]:
-                if cells1.issubset(cells2):
-                    diff_cells = cells2.difference(cells1)
+        # Number the frontier cells and encode each constraint as an int bitmask,
+        # so subset tests and differences are single bitwise operations
+        cells = list(self.frontier)
+        bits = {cell: 1 << index for index, cell in enumerate(cells)}
+        masks = []
+        # Ids of the constraints containing each frontier cell
+        cell_to_constraints = defaultdict(list)
+        for index, (unopened, _) in enumerate(self.constraint_list):
+            mask = 0
+            for cell in unopened:
+                mask |= bits[cell]
+                cell_to_constraints[cell].append(index)
+            masks.append(mask)
+
+        for index1, (cells1, mines1) in enumerate(self.constraint_list):
+            mask1 = masks[index1]
+            # A superset of cells1 contains any one of its cells, so only the
+            # constraints on that cell need testing
+            for index2 in cell_to_constraints[next(iter(cells1))]:
+                mask2 = masks[index2]
+                if index2 != index1 and mask1 & mask2 == mask1:
+                    cells2, mines2 = self.constraint_list[index2]
+                    diff_mask = mask2 & ~mask1
                     diff_mines = mines2 - mines1
 
                     # If remaining cells are mines, mark them as such
-                    if len(diff_cells) == diff_mines and diff_mines > 0:
-                        for mine in diff_cells:
-                            if mine not in self.known_mines:
-                                self.known_mines.add(mine)
-                                self.mines_found += 1
+                    if len(cells2) - len(cells1) == diff_mines and diff_mines > 0:
+                        for mine in self.mask_cells(diff_mask, cells):
+                            if self.mark_mine(mine):
                                 made_progress = True
 
                     # If remaining cell are safe, mark them as such
                     elif diff_mines == 0:
-                        for safe in diff_cells:
-                            if safe not in self.known_safe:
-                                self.known_safe.add(safe)
+                        for safe in self.mask_cells(diff_mask, cells):
+                            if self.mark_safe(safe):
                                 made_progress = True
 
         return made_progress
 
-    # Calculate risk probabilities for unopened cells for when there are no guaranteed safe moves
-    def calculate_cell_probabilities(self) -> Dict[Tuple[int, int], float]:
-        probabilities = defaultdict(float)
+    # Decode a frontier bitmask back into the cell ids it covers
+    @staticmethod
+    def mask_cells(mask: int, cells: List[int]) -> List[int]:
+        decoded = []
+        while mask:
+            low_bit = mask & -mask
+            decoded.append(cells[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return decoded
+
+    # Ids of the unopened cells on the board, in ascending (row-major) order
+    def unopened_cell_ids(self) -> np.ndarray:
+        unopened = ~self.game.is_open
+        unopened[[0, -1], :] = False  # the padding is never opened
+        unopened[:, [0, -1]] = False
+        return np.flatnonzero(unopened)
+
+    # Calculate risk probabilities for unopened cells for when there are no guaranteed safe moves;
+    # returns the cell ids in ascending order and their probabilities
+    def calculate_cell_probabilities(self) -> Tuple[np.ndarray, np.ndarray]:
         remaining_mines = self.total_mines - self.mines_found
 
         # If no constraints, use global probability
         if not self.frontier:
-            unopened_count = 0
-            for i in range(1, self.game.ROW + 1):
-                for j in range(1, self.game.COLUMNS + 1):
-                    if not self.game.buttons[i][j].is_open:
-                        unopened_count += 1
-                        probabilities[(i, j)] = remaining_mines / \
-                            unopened_count
-            return probabilities
+            cells = self.unopened_cell_ids()
+            # The remaining mines are spread evenly over the unopened cells not known to be mines
+            cells = cells[~self.known_mine_flags[cells]]
+            return cells, np.full(len(cells), remaining_mines / max(len(cells), 1))
 
         # Calculate local probabilities based on constraints
-        for cell, constraint_list in self.constraints.items():
-            for unopened_cells, remaining_local_mines in constraint_list:
-                if unopened_cells:  # Avoid division by zero
-                    prob = remaining_local_mines / len(unopened_cells)
-                    for pos in unopened_cells:
-                        probabilities[pos] = max(probabilities[pos], prob)
-
-        return probabilities
-    
+        return self.constraint_risk(self.snapshot)
+
+    # Highest local mine probability of each frontier cell, cached per constraint snapshot
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def constraint_risk(snapshot: FrozenSet[Tuple[FrozenSet[int], int]]
+                        ) -> Tuple[np.ndarray, np.ndarray]:
+        sizes = np.fromiter((len(unopened_cells) for unopened_cells, _ in snapshot),
+                            dtype=np.intp, count=len(snapshot))  # constraints are never empty
+        mines = np.fromiter((remaining_local_mines for _, remaining_local_mines in snapshot),
+                            dtype=float, count=len(snapshot))
+        cells = np.fromiter(chain.from_iterable(unopened_cells for unopened_cells, _ in snapshot),
+                            dtype=np.intp, count=int(sizes.sum()))
+
+        # Give every cell the highest probability among the constraints covering it
+        cell_ids, positions = np.unique(cells, return_inverse=True)
+        risk_scores = np.zeros(len(cell_ids))
+        np.maximum.at(risk_scores, positions, np.repeat(mines / sizes, sizes))
+        cell_ids.flags.writeable = risk_scores.flags.writeable = False  # shared through the cache
+        return cell_ids, risk_scores
 
     # Get the unopened cell with the lowest risk probability
     def get_lowest_risk_move(self) -> Tuple[int, int]:
-        probabilities = self.calculate_cell_probabilities()
+        cells, probabilities = self.calculate_cell_probabilities()
 
-        if not probabilities:
+        if not len(cells):
             print("Probabilities Not Calculated")
             # If no probabilities calculated, choose first unopened cell
-            for i in range(1, self.game.ROW + 1):
-                for j in range(1, self.game.COLUMNS + 1):
-                    if not self.game.buttons[i][j].is_open:
-                        return (i, j)
-        
-        # Return position with lowest probability of being a mine
-        return min(probabilities.items(), key=lambda x: x[1])[0]
+            for cell in self.unopened_cell_ids():
+                return self.cell_coords(int(cell))
+
+        # Return position with lowest probability of being a mine; argmin takes the first
+        # of equal probabilities, and cells are sorted, so ties go to the lowest cell id
+        return self.cell_coords(int(cells[np.argmin(probabilities)]))
+
+    # Pop the next queued safe cell that has not been opened in the meantime
+    def next_safe_move(self) -> Optional[Tuple[int, int]]:
+        while self.safe_queue:
+            cell = self.safe_queue.popleft()
+            if not self.is_open[cell]:
+                return self.cell_coords(cell)
+        return None
 
     def make_move(self):# -> Tuple[int, int]:
         # First click should be in the center
         if self.game.IS_FIRST_CLICK:
             return (self.game.ROW // 2, self.game.COLUMNS // 2), 0
 
-        # Click any known safe cells
-        if self.known_safe:
-            return self.known_safe.pop(), 0
+        # Click any known safe cells before running the solver again
+        ret_coord = self.next_safe_move()
+        if ret_coord:
+            return ret_coord, 0
 
         # Apply solving techniques
         while self.basic_solve() or self.advanced_solve():
-            if self.known_safe:
-                ret_coord = self.known_safe.pop()
+            ret_coord = self.next_safe_move()
+            if ret_coord:
                 return ret_coord, 0
         
         # If no safe moves found, use probability estimation
@@ -228,12 +424,6 @@ class MinesweeperSolver:
 
 # Test class
 class MinesweeperTester:
-    def _init__(self):
-        self.test = test
-        self.is_first_run = True
-        # list of list of results for each game [is_win, time, num_moves, guesses]
-        self.game_results: List[List[bool, float, int, int]] = []
-
     @staticmethod
     def set_difficulty(game, difficulty):
         """Set the game difficulty before starting."""
@@ -244,14 +434,23 @@ class MinesweeperTester:
             game.COLUMNS = preset['columns']
             game.MINES = preset['mines']
 
+    # Play one headless game and return its [is_win, time, num_moves, guesses]
     @staticmethod
-    def run_one_game(difficulty=None):
-        game = MineSweeper()
+    def run_one_game(difficulty=None) -> List:
+        return MinesweeperTester.run_games(difficulty, 1)[0]
+
+    # Play several headless games on one reused MineSweeper and return their results
+    @staticmethod
+    def run_games(difficulty=None, num_games: int = 1) -> List[List]:
+        game = MineSweeper(testing=True)
         if difficulty:
             MinesweeperTester.set_difficulty(game, difficulty)
-        game.testing = True
-        # Use headless mode instead of GUI
-        game.start_headless()
+        game_results = []
+        for _ in range(num_games):
+            # Use headless mode instead of GUI
+            game.start_headless()
+            game_results.append(game.game_result)
+        return game_results
 
     @classmethod
     def run_testing(cls, num_games, difficulty=None):
@@ -271,27 +470,28 @@ class MinesweeperTester:
         loss_guesses = []
         win_guesses = []
 
-        # Loop for number of games desired for testing
-        for this_game in tqdm(range(num_games)):
-            # Set booleans to know if variables need to be initialized
-            if this_game == 0:
-                test.is_first_run = True
-            else:
-                test.is_first_run = False
-
-            # Run a game with specified difficulty
-            cls.run_one_game(difficulty)
-
-            if test.game_results[this_game][is_win_index]:
+        # Games share no state, so run them in batches across worker processes;
+        # each batch plays its games on one reused board
+        batch_size = max(1, num_games // (8 * (os.cpu_count() or 1)))
+        batches = [min(batch_size, num_games - start) for start in range(0, num_games, batch_size)]
+        game_results = []
+        with ProcessPoolExecutor(mp_context=mp.get_context('spawn')) as executor, \
+                tqdm(total=num_games) as progress:
+            for batch_results in executor.map(cls.run_games, [difficulty] * len(batches), batches):
+                game_results.extend(batch_results)
+                progress.update(len(batch_results))
+
+        for game_result in game_results:
+            if game_result[is_win_index]:
                 total_wins += 1
-                win_times.append(test.game_results[this_game][time_index] * 1000)
-                win_steps.append(test.game_results[this_game][num_moves_index])
-                win_guesses.append(test.game_results[this_game][guesses_index])
+                win_times.append(game_result[time_index] * 1000)
+                win_steps.append(game_result[num_moves_index])
+                win_guesses.append(game_result[guesses_index])
             else:
                 total_losses += 1
-                loss_times.append(test.game_results[this_game][time_index] * 1000)
-                loss_steps.append(test.game_results[this_game][num_moves_index])
-                loss_guesses.append(test.game_results[this_game][guesses_index])
+                loss_times.append(game_result[time_index] * 1000)
+                loss_steps.append(game_result[num_moves_index])
+                loss_guesses.append(game_result[guesses_index])
 
             
 
@@ -334,26 +534,27 @@ class MinesweeperTester:
             bucket_size = 10
 
 
-        plt.ioff()  # Disable interactive mode temporarily
-        
+        # Draw on a standalone Agg figure, so no pyplot global state is created or kept
+        fig = Figure()
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.subplots()
+
         max_value = max(list) if list else 0
         bins = np.arange(0, max_value + bucket_size, bucket_size)
 
         hist, bin_edges = np.histogram(list, bins=bins)
-        plt.bar(bin_edges[:-1], hist, width=bucket_size, edgecolor="black", align="edge")
-        plt.xlabel(f"Number of Steps to Lose (Buckets of {bucket_size})")
-        plt.ylabel("Frequency")
-        plt.title("Frequency of Steps to Lose")
+        ax.bar(bin_edges[:-1], hist, width=bucket_size, edgecolor="black", align="edge")
+        ax.set_xlabel(f"Number of Steps to Lose (Buckets of {bucket_size})")
+        ax.set_ylabel("Frequency")
+        ax.set_title("Frequency of Steps to Lose")
 
-        plt.tight_layout()
+        fig.tight_layout()
         if difficulty == "easy":
-            plt.savefig("./Easy_Step_Frequencies.png")
+            canvas.print_png("./Easy_Step_Frequencies.png")
         elif difficulty == "intermediate":
-            plt.savefig("./Intermediate_Step_Frequencies.png")
+            canvas.print_png("./Intermediate_Step_Frequencies.png")
         elif difficulty == "advanced":
-            plt.savefig("./Advanced_Step_Frequencies.png")
-
-        plt.close('all')  # Close all open figures to free resources
+            canvas.print_png("./Advanced_Step_Frequencies.png")
         
         
         
@@ -378,32 +579,39 @@ class MineSweeper:
 
     def change_difficulty(self, difficulty: str):
         """Change the game difficulty and reload the board."""
-        if difficulty in self.DIFFICULTY_PRESETS:
-            MineSweeper.CURRENT_DIFFICULTY = difficulty
-            preset = self.DIFFICULTY_PRESETS[difficulty]
-            MineSweeper.ROW = preset['rows']
-            MineSweeper.COLUMNS = preset['columns']
-            MineSweeper.MINES = preset['mines']
-
-            # Store current window reference
-            if not self.testing and hasattr(self, 'window'):
-                old_window = self.window
-                old_window.destroy()
-
-            # Reinitialize everything
-            self.__init__()
-            if not self.testing:
-                self.create_widgets()
-
-    def __init__(self):
-        self.testing = False  # Skip GUI initialization if in testing mode
+        # The auto-solve worker may be part way through a move on the board being replaced
+        with self.state_lock:
+            if difficulty in self.DIFFICULTY_PRESETS:
+                MineSweeper.CURRENT_DIFFICULTY = difficulty
+                preset = self.DIFFICULTY_PRESETS[difficulty]
+                MineSweeper.ROW = preset['rows']
+                MineSweeper.COLUMNS = preset['columns']
+                MineSweeper.MINES = preset['mines']
+
+                # Store current window reference
+                if not self.testing and hasattr(self, 'window'):
+                    old_window = self.window
+                    old_window.destroy()
+
+                # Reinitialize everything
+                self.__init__(self.testing)
+                if not self.testing:
+                    self.create_widgets()
+
+    def __init__(self, testing: bool = False):
+        self.testing = testing  # Skip GUI initialization if in testing mode
         self.buttons = []
-        self.solver = MinesweeperSolver(self)
+        self.allocate_board()
         self.auto_solve = False
+        self.no_animate = False  # Play auto-solve moves as fast as they are found
+        self.solver_thread = None  # Auto-solve worker; see solver_worker
+        self.state_lock = threading.RLock()  # Serializes solver moves with board updates
         self.solve_start_time = None
         self.solve_total_time = 0.0
         self.move_count = 0
         self.guesses = 0
+        # [is_win, time, num_moves, guesses] once a headless game is over
+        self.game_result: Optional[List] = None
 
         self.IS_GAME_OVER = False
         self.IS_LOSS = False
@@ -415,47 +623,73 @@ class MineSweeper:
             self.window = tk.Tk()
             self.window.geometry('+800+200')
 
-            for i in range(self.ROW+2):
-                temp = []
-                for j in range(self.COLUMNS+2):
-                    btn = MyButton(self.window, x=i, y=j)
-                    btn.config(command=lambda button=btn: self.click(button))
-                    btn.bind('<Button-3>', self.right_click)
-                    temp.append(btn)
-                self.buttons.append(temp)
+            # The board is one canvas with a few items per cell, rather than a widget per cell;
+            # clicks are mapped back to cells from their canvas coordinates
+            self.canvas = tk.Canvas(self.window, width=self.COLUMNS * CELL_SIZE,
+                                    height=self.ROW * CELL_SIZE, highlightthickness=0)
+            self.canvas.bind('<Button-1>', self.left_click)
+            self.canvas.bind('<Button-3>', self.right_click)
+            self.buttons = self.empty_button_grid()
+            for i in range(1, self.ROW+1):
+                for j in range(1, self.COLUMNS+1):
+                    self.buttons[i][j] = MyButton(self.canvas, self, x=i, y=j)
 
             # Load images after initializing Tkinter window
-            self.flag_img = ImageTk.PhotoImage(Image.open("img/flag.png"))
-            self.mine_img = ImageTk.PhotoImage(Image.open("img/mine.png"))
+            # Tk 8.6 decodes PNG natively, so no PIL conversion is needed
+            self.flag_img = tk.PhotoImage(file="img/flag.png")
+            self.mine_img = tk.PhotoImage(file="img/mine.png")
 
             # Timer label
             self.timer_label = tk.Label(
                 self.window, text="Time: 0.00s | Moves: 0", font=('Calibri', 12))
 
+        self.solver = MinesweeperSolver(self)
+
+    # Button grid indexed like the board arrays; the padding border is only needed
+    # by the arrays, so it holds None instead of cells
+    def empty_button_grid(self) -> List[List[Optional[Cell]]]:
+        return [[None] * (self.COLUMNS + 2) for _ in range(self.ROW + 2)]
+
+    # Allocate the padded open, mine and neighbour-count grids for the current board size
+    def allocate_board(self):
+        self.is_open = np.zeros((self.ROW + 2, self.COLUMNS + 2), dtype=bool)
+        self.is_mine = np.zeros((self.ROW + 2, self.COLUMNS + 2), dtype=np.uint8)
+        self.count_bomb = np.zeros_like(self.is_mine)
+        self.opened_count = 0  # safe cells opened so far, for check_win
+        self.mines_placed = self.MINES  # set by insert_mines on the first click
+
     def insert_mines(self, number: int):
-        index_mines = self.get_mines_places(number)
-        # print(index_mines)
-        for i in range(1, self.ROW+1):
-            for j in range(1, self.COLUMNS+1):
-                btn = self.buttons[i][j]
-                if btn.number in index_mines:
-                    btn.is_mine = True
+        # Cell numbers are 1-based and row-major, so map them straight onto the grid
+        index_mines = np.fromiter(self.get_mines_places(number), dtype=np.intp) - 1
+        # Boards too small to keep the first click's neighbours clear get fewer mines
+        self.mines_placed = len(index_mines)
+        self.is_mine[index_mines // self.COLUMNS + 1,
+                     index_mines % self.COLUMNS + 1] = 1
 
     def start_headless(self):
         """Start the game in headless mode (no GUI) for faster testing"""
         if not self.testing:
             return
 
-        # Initialize the game board without GUI elements
-        self.buttons = []
-        for i in range(self.ROW+2):
-            temp = []
-            for j in range(self.COLUMNS+2):
-                btn = MyButton(None, x=i, y=j)  # None as master means no GUI
-                btn.number = (i-1) * self.COLUMNS + \
-                    j if 1 <= i <= self.ROW and 1 <= j <= self.COLUMNS else 0
-                temp.append(btn)
-            self.buttons.append(temp)
+        # Initialize the game board without GUI elements; cells only hold their
+        # coordinates, so a previous game's cells are kept if the size is unchanged
+        self.allocate_board()
+        if len(self.buttons) != self.ROW + 2 or len(self.buttons[0]) != self.COLUMNS + 2:
+            self.buttons = self.empty_button_grid()
+            for i in range(1, self.ROW+1):
+                for j in range(1, self.COLUMNS+1):
+                    self.buttons[i][j] = Cell(self, x=i, y=j, number=(i-1) * self.COLUMNS + j)
+        self.solver = MinesweeperSolver(self)  # rebuilt for this board's size and arrays
+
+        # Reset the per-game state in case this game played before
+        self.IS_GAME_OVER = False
+        self.IS_LOSS = False
+        self.IS_WIN = False
+        self.IS_FIRST_CLICK = True
+        self.move_count = 0
+        self.guesses = 0
+        self.solve_total_time = 0.0
+        self.game_result = None
 
         # Start timer
         self.solve_start_time = time.time()
@@ -477,80 +711,94 @@ class MineSweeper:
             current_time = time.time()
             self.solve_total_time = current_time - self.solve_start_time
 
-    def get_mines_places(self, exclude_number: int):
-        indexes = list(range(1, self.COLUMNS * self.ROW + 1))
-        
-        safe_squares = []
-        for i in [-1, 0, 1]:
-            for j in [-1, 0, 1]:
-                safe_squares.append(exclude_number + i * self.COLUMNS + j)
-        
-        for i in safe_squares:
-            if i > 0 and i < self.COLUMNS * self.ROW + 1:
-                indexes.remove(i)
-        
-
-        shuffle(indexes)
-        return indexes[:self.MINES]
-
-    def breadth_first_search(self, btn: MyButton):
-        queue = [btn]
+    def get_mines_places(self, exclude_number: int) -> Set[int]:
+        cell_count = self.COLUMNS * self.ROW
+
+        # The first clicked cell and its neighbours must stay mine free
+        safe_squares = {exclude_number + i * self.COLUMNS + j
+                        for i in [-1, 0, 1] for j in [-1, 0, 1]}
+
+        # Draw a few extra cells so enough picks survive dropping the safe squares
+        picks = sample(range(1, cell_count + 1),
+                       min(cell_count, self.MINES + len(safe_squares)))
+        return set([p for p in picks if p not in safe_squares][:self.MINES])
+
+    def breadth_first_search(self, btn: Cell):
+        # Walk cell ids over the solver's neighbour table, which only holds in-bounds cells
+        solver = self.solver
+        start = solver.cell_id(btn.x, btn.y)
+        queue = deque([start])
+        queued = {start}  # cells already queued, for O(1) membership checks
+        revealed = []
+        is_open, count_bomb = solver.is_open, solver.count_bomb
         while queue:
-            cur_btn = queue.pop()
-            color = COLORS.get(cur_btn.count_bomb, 'black')
-            if cur_btn.count_bomb:
-                cur_btn.config(text=cur_btn.count_bomb,
-                               disabledforeground=color,
-                               # Set revealed color
-                               background=BUTTON_COLORS['revealed'])
-            else:
-                cur_btn.config(text='',
-                               disabledforeground=color,
-                               # Set revealed color
-                               background=BUTTON_COLORS['revealed'])
-            cur_btn.is_open = True
-            cur_btn.config(state='disabled')
-            cur_btn.config(relief=tk.SUNKEN)
-            if cur_btn.count_bomb == 0:
-                x, y = cur_btn.x, cur_btn.y
-                for dx in [-1, 0, 1]:
-                    for dy in [-1, 0, 1]:
-                        next_btn = self.buttons[x+dx][y+dy]
-                        if not next_btn.is_open and 1 <= next_btn.x <= self.ROW and \
-                                1 <= next_btn.y <= self.COLUMNS and next_btn not in queue:
-                            queue.append(next_btn)
+            cell = queue.popleft()
+            if not is_open[cell]:
+                is_open[cell] = True
+                self.opened_count += 1
+            solver.dirty_cells.add(cell)
+            revealed.append(cell)
+            if count_bomb[cell] == 0:
+                for neighbor in solver.neighbors[cell]:
+                    if not is_open[neighbor] and neighbor not in queued:
+                        queued.add(neighbor)
+                        queue.append(neighbor)
+
+        if self.testing:
+            return
+
+        # Reveal the whole region with one configure per button; Tk redraws it
+        # along with any other pending changes once the event loop is idle
+        for cell in revealed:
+            x, y = solver.cell_coords(cell)
+            cur_btn = self.buttons[x][y]
+            count_bomb = cur_btn.count_bomb
+            cur_btn.configure(text=count_bomb if count_bomb else '',
+                              disabledforeground=COLOR_BY_COUNT[count_bomb],
+                              # Set revealed color
+                              background=BUTTON_COLORS['revealed'],
+                              state='disabled')
 
     def count_mine_in_buttons(self):
-        for i in range(1, self.ROW+1):
-            for j in range(1, self.COLUMNS+1):
-                btn = self.buttons[i][j]
-                count_bomb = 0
-                if not btn.is_mine:
-                    for row_dx in [-1, 0, 1]:
-                        for col_dx in [-1, 0, 1]:
-                            neighbour = self.buttons[i+row_dx][j+col_dx]
-                            if neighbour.is_mine:
-                                count_bomb += 1
-                btn.count_bomb = count_bomb
+        # Add the eight neighbour-shifted views of the padded mine grid in place
+        mines = self.is_mine
+        counts = self.count_bomb[1:-1, 1:-1]
+        counts.fill(0)
+        for i, j in product(range(3), repeat=2):
+            if (i, j) != (1, 1):
+                counts += mines[i:i + self.ROW, j:j + self.COLUMNS]
+        # Mines themselves keep a count of 0
+        counts[mines[1:-1, 1:-1] != 0] = 0
+
+    # Board cell under a canvas click, or None outside the board
+    def cell_at(self, event) -> Optional[MyButton]:
+        x, y = event.y // CELL_SIZE + 1, event.x // CELL_SIZE + 1
+        if 1 <= x <= self.ROW and 1 <= y <= self.COLUMNS:
+            return self.buttons[x][y]
+        return None
+
+    # Left clicks on the board; opened and flagged cells are disabled
+    def left_click(self, event):
+        cur_btn = self.cell_at(event)
+        if cur_btn is not None and cur_btn.state == 'normal':
+            self.button_click(cur_btn)
 
     def right_click(self, event):
         if self.IS_GAME_OVER or self.testing:  # Don't handle right clicks in testing mode
             return
-        cur_btn = event.widget
-        if cur_btn['state'] == 'normal':
-            cur_btn['state'] = 'disabled'
-            cur_btn.flag_image = self.flag_img
-            cur_btn['image'] = cur_btn.flag_image
-            # Set flagged color
-            cur_btn.config(background=BUTTON_COLORS['flagged'])
-        elif cur_btn['state'] == 'disabled':
-            cur_btn['image'] = ''
-            cur_btn.flag_image = None
-            cur_btn['state'] = 'normal'
-            # Reset to default color
-            cur_btn.config(background=BUTTON_COLORS['default'])
-
-    def click(self, clicked_button: MyButton):
+        cur_btn = self.cell_at(event)
+        if cur_btn is None or cur_btn.is_open:  # only unopened cells can be flagged
+            return
+        if cur_btn.state == 'normal':
+            cur_btn.configure(state='disabled', image=self.flag_img,
+                              # Set flagged color
+                              background=BUTTON_COLORS['flagged'])
+        else:
+            cur_btn.configure(state='normal', image='',
+                              # Reset to default color
+                              background=BUTTON_COLORS['default'])
+
+    def click(self, clicked_button: Cell):
         self.move_count += 1
         if self.IS_GAME_OVER:
             self.reload()
@@ -561,48 +809,52 @@ class MineSweeper:
             self.IS_FIRST_CLICK = False
         if clicked_button.is_mine:
             if not self.testing:
-                clicked_button.mine_image = self.mine_img
-                clicked_button.config(image=clicked_button.mine_image,
-                                      # Set mine color
-                                      background=BUTTON_COLORS['mine'],
-                                      disabledforeground='black')
+                clicked_button.configure(image=self.mine_img,
+                                         # Set mine color
+                                         background=BUTTON_COLORS['mine'],
+                                         disabledforeground='black',
+                                         state='disabled')
             clicked_button.is_open = True
+            self.solver.dirty_cells.add(self.solver.cell_id(clicked_button.x, clicked_button.y))
             self.IS_GAME_OVER = True
             self.IS_LOSS = True
             
 
             if self.testing:
-                if test.is_first_run:
-                    test.game_results = []
-                test.game_results.append(
-                    [False, self.solve_total_time, self.move_count, self.guesses])
-                self.window.quit()
+                self.game_result = [False, self.solve_total_time, self.move_count, self.guesses]
                 return
 
             showinfo('Game over', 'You lose!')
             print("move count = ", self.move_count)
             if not self.testing:
-                for i in range(1, self.ROW+1):
-                    for j in range(1, self.COLUMNS+1):
-                        btn = self.buttons[i][j]
-                        if btn.is_mine:
-                            btn.mine_image = self.mine_img
-                            btn['image'] = btn.mine_image
-                            # Set mine color
-                            btn.config(background=BUTTON_COLORS['mine'])
+                # Reveal every mine with one configure per button and a single redraw
+                mine_buttons = [self.buttons[i][j] for i, j in np.argwhere(self.is_mine)]
+                try:
+                    for btn in mine_buttons:
+                        btn.configure(image=self.mine_img,
+                                      # Set mine color
+                                      background=BUTTON_COLORS['mine'])
+                finally:
+                    self.window.update_idletasks()
                 self.reload()
+                return
         else:
-            color = COLORS.get(clicked_button.count_bomb, 'black')
-            if clicked_button.count_bomb:
-                clicked_button.config(text=clicked_button.count_bomb,
-                                      disabledforeground=color,
-                                      # Set revealed color
-                                      background=BUTTON_COLORS['revealed'])
-                clicked_button.is_open = True
+            count_bomb = clicked_button.count_bomb
+            if count_bomb:
+                if not self.testing:
+                    # One configure call per click instead of one per option
+                    clicked_button.configure(text=count_bomb,
+                                             disabledforeground=COLOR_BY_COUNT[count_bomb],
+                                             # Set revealed color
+                                             background=BUTTON_COLORS['revealed'],
+                                             state='disabled')
+                if not clicked_button.is_open:
+                    clicked_button.is_open = True
+                    self.opened_count += 1
+                self.solver.dirty_cells.add(self.solver.cell_id(clicked_button.x, clicked_button.y))
             else:
+                # The flood fill configures the clicked button along with its region
                 self.breadth_first_search(clicked_button)
-        clicked_button.config(state='disabled')
-        clicked_button.config(relief=tk.SUNKEN)
 
         # Check for win condition
         if self.check_win():
@@ -611,23 +863,14 @@ class MineSweeper:
 
             # Different response for testing (due to looping)
             if self.testing:
-                if test.is_first_run:
-                    test.game_results = []
-                test.game_results.append(
-                    [True, self.solve_total_time, self.move_count, self.guesses])
-                self.window.quit()
+                self.game_result = [True, self.solve_total_time, self.move_count, self.guesses]
                 return
 
             showinfo('Congratulations', 'You won!')
 
     # Check if all non-mine cells are opened
     def check_win(self):
-        for i in range(1, self.ROW+1):
-            for j in range(1, self.COLUMNS+1):
-                btn = self.buttons[i][j]
-                if not btn.is_mine and not btn.is_open:
-                    return False
-        return True
+        return self.opened_count >= self.ROW * self.COLUMNS - self.mines_placed
 
     def add_ai_controls(self):
         control_frame = tk.Frame(self.window)
@@ -642,27 +885,58 @@ class MineSweeper:
                              command=self.toggle_auto_solve)
         auto_btn.pack(side=tk.LEFT, padx=5)
 
+        no_animate_btn = tk.Checkbutton(control_frame, text="No Animation",
+                                        command=self.toggle_no_animate)
+        no_animate_btn.pack(side=tk.LEFT, padx=5)
+
         # Add timer label to the control frame
         self.timer_label.grid(row=0, column=self.COLUMNS+2, padx=5)
 
+    # Manual clicks are ignored while the auto-solve worker owns the board; the lock
+    # waits out a move the worker started before auto solve was turned off
+    def button_click(self, button: MyButton):
+        with self.state_lock:
+            if self.auto_solve and not self.IS_GAME_OVER:
+                return
+            self.click(button)
+
     def make_ai_move(self):
-        if not self.IS_GAME_OVER:
+        with self.state_lock:
+            if not self.IS_GAME_OVER and not self.auto_solve:
+                self.play_ai_move(self.solver.make_move())
+
+    def play_ai_move(self, move):
+        with self.state_lock:
             # Start timer on first move
             if self.solve_start_time is None:
                 self.solve_start_time = time.time()
 
-            move_coords, guesses = self.solver.make_move()
+            move_coords, guesses = move
             self.guesses += guesses
             x, y = move_coords
             btn = self.buttons[x][y]
             self.click(btn)
 
+            # A lost game reloads the board, which already reset the timer and moves
+            if self.solve_start_time is None:
+                return
+
             # Update move count and timer
             self.move_count += 1
             current_time = time.time()
             self.solve_total_time = current_time - self.solve_start_time
             self.update_timer_label()
 
+    # A dropped safe move was already taken off safe_queue, and mark_safe will not queue
+    # a known safe cell again, so put it back for Get Hint or the next auto solve
+    def requeue_safe_move(self, move):
+        with self.state_lock:
+            (x, y), guesses = move
+            cell = self.solver.cell_id(x, y)
+            # After a reload the solver is new and never knew this cell
+            if not guesses and cell in self.solver.known_safe and not self.solver.is_open[cell]:
+                self.solver.safe_queue.appendleft(cell)
+
     def update_timer_label(self):
         self.timer_label.config(
             text=f"Time: {self.solve_total_time:.2f}s | Moves: {self.move_count}")
@@ -675,12 +949,62 @@ class MineSweeper:
             self.solve_total_time = 0.0
             self.move_count = 0
             self.update_timer_label()
-            self.auto_solve_step()
 
-    def auto_solve_step(self):
-        if self.auto_solve and not self.IS_GAME_OVER:
-            self.make_ai_move()
-            self.window.after(500, self.auto_solve_step)
+            # Solve on a worker thread and play its moves from the Tk event loop
+            move_queue = queue.Queue()
+            self.solver_thread = threading.Thread(
+                target=self.solver_worker, args=(move_queue,), daemon=True)
+            self.solver_thread.start()
+            self.window.after_idle(self.auto_solve_step, move_queue, self.solver_thread)
+
+    def toggle_no_animate(self):
+        self.no_animate = not self.no_animate
+
+    # Worker thread: post one move at a time and wait until the Tk thread has played it
+    def solver_worker(self, move_queue: queue.Queue):
+        while True:
+            with self.state_lock:
+                if not self.auto_solve or self.IS_GAME_OVER or \
+                        self.solver_thread is not threading.current_thread():
+                    return
+                move = self.solver.make_move()
+            move_queue.put(move)
+            move_queue.join()
+
+    def auto_solve_step(self, move_queue: queue.Queue, worker: threading.Thread):
+        step_start = time.time()
+        # Without animation, play every move found within a frame before returning to
+        # the event loop, so the board is redrawn once per frame instead of once per move
+        batch = self.no_animate or not self.window.winfo_viewable()
+        while True:
+            try:
+                if batch:
+                    remaining = AUTO_SOLVE_FRAME_MS / 1000 - (time.time() - step_start)
+                    move = move_queue.get(timeout=max(0.0, remaining))
+                else:
+                    move = move_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            # Moves posted after auto solve was stopped are dropped
+            playing = self.auto_solve and not self.IS_GAME_OVER and worker is self.solver_thread
+            if playing:
+                self.play_ai_move(move)
+            else:
+                self.requeue_safe_move(move)
+            move_queue.task_done()
+            if not batch or not playing:
+                break
+
+        # Keep polling until the worker exits so it never waits on an undrained move
+        if worker.is_alive():
+            if batch:
+                delay = 1  # Nothing to animate, so take moves as soon as they arrive
+            else:
+                # Next move on the next frame, minus the time this one took
+                elapsed_ms = int((time.time() - step_start) * 1000)
+                delay = max(1, AUTO_SOLVE_FRAME_MS - elapsed_ms)
+            self.window.after(delay, self.auto_solve_step, move_queue, worker)
 
     def create_widgets(self):
         menubar = tk.Menu(self.window)
@@ -694,36 +1018,55 @@ class MineSweeper:
         count = 1
         for i in range(1, self.ROW+1):
             for j in range(1, self.COLUMNS+1):
-                btn = self.buttons[i][j]
-                btn.number = count
-                btn.grid(row=i, column=j, stick='NWES')
+                self.buttons[i][j].number = count
                 count += 1
-        for i in range(1, self.ROW+1):
-            tk.Grid.rowconfigure(self.window, i, weight=1)
-        for i in range(1, self.COLUMNS+1):
-            tk.Grid.columnconfigure(self.window, i, weight=1)
+        # The canvas takes the grid cells the board buttons used to occupy
+        self.canvas.grid(row=1, column=1, rowspan=self.ROW, columnspan=self.COLUMNS)
         self.add_ai_controls()
 
+    # Reset the existing buttons and board state for a new game of the same size
+    def reset_board(self):
+        self.allocate_board()
+        self.solver = MinesweeperSolver(self)
+        self.auto_solve = False
+        self.guesses = 0
+
+        self.IS_LOSS = False
+        self.IS_WIN = False
+
+        for i in range(1, self.ROW+1):
+            for j in range(1, self.COLUMNS+1):
+                btn = self.buttons[i][j]
+                btn.configure(text='', image='', state='normal',
+                              background=BUTTON_COLORS['default'])
+
     def reload(self):
-        # Store current window reference
-        if not self.testing and hasattr(self, 'window'):
-            old_window = self.window
-            old_window.destroy()
+        # The auto-solve worker may be part way through a move on the board being replaced
+        with self.state_lock:
+            if not self.testing and hasattr(self, 'window') and \
+                    len(self.buttons) == self.ROW + 2 and len(self.buttons[0]) == self.COLUMNS + 2:
+                # Same board size, so keep the window, buttons and images
+                self.reset_board()
+            else:
+                # Store current window reference
+                if not self.testing and hasattr(self, 'window'):
+                    old_window = self.window
+                    old_window.destroy()
 
-        # Reinitialize everything
-        self.__init__()
-        if not self.testing:
-            self.create_widgets()
+                # Reinitialize everything
+                self.__init__(self.testing)
+                if not self.testing:
+                    self.create_widgets()
 
-        self.IS_FIRST_CLICK = True
-        self.IS_GAME_OVER = False
+            self.IS_FIRST_CLICK = True
+            self.IS_GAME_OVER = False
 
-        # Reset timer and move count
-        self.solve_start_time = None
-        self.solve_total_time = 0.0
-        self.move_count = 0
-        if not self.testing:
-            self.update_timer_label()
+            # Reset timer and move count
+            self.solve_start_time = None
+            self.solve_total_time = 0.0
+            self.move_count = 0
+            if not self.testing:
+                self.update_timer_label()
 
     def create_settings_win(self):
         win_settings = tk.Toplevel(self.window)
@@ -820,6 +1163,5 @@ if __name__ == "__main__":
         game.start()
     else:
         # Run testing with specified difficulty
-        test = MinesweeperTester
-        test.run_testing(args.test, args.difficulty)
+        MinesweeperTester.run_testing(args.test, args.difficulty)
 